@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GPA计算核心
+功能：命令行版和图形界面版共用的数据处理流程
+流程：识别列名 -> 转换数字 -> 过滤无效行 -> 汇总GPA
+"""
+
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from gpa_index import find_group_columns
+
+# 学分列的可能名称
+CREDIT_NAMES = ['学分', '学时', 'credit', 'credits', '学分数']
+# 绩点列的可能名称
+GRADE_NAMES = ['绩点', '成绩', 'gpa', 'grade', '绩点成绩']
+# 课程名称列的可能名称
+COURSE_NAMES = ['课程', '课程名称', 'course', '科目', '课程名']
+
+
+def resolve_columns(columns) -> Dict[Any, str]:
+    """
+    识别学分、绩点、课程名称及分组列
+
+    Args:
+        columns: DataFrame的列名
+
+    Returns:
+        Dict: 原始列名到标准列名的映射
+
+    Raises:
+        ValueError: 未找到学分列或绩点列
+    """
+    columns = list(columns)
+
+    # 查找学分列
+    credit_col = None
+    for col in columns:
+        if any(name.lower() in str(col).lower() for name in CREDIT_NAMES):
+            credit_col = col
+            break
+
+    # 查找绩点列 - 精确匹配优先，避免误匹配
+    grade_col = None
+    for col in columns:
+        if str(col).strip() == '绩点':
+            grade_col = col
+            break
+
+    # 如果精确匹配失败，再尝试模糊匹配
+    if grade_col is None:
+        for col in columns:
+            col_lower = str(col).lower()
+            if col_lower == 'gpa' or col_lower == 'grade' or '绩点' in col_lower:
+                grade_col = col
+                break
+
+    if credit_col is None:
+        raise ValueError(f"未找到学分列。请确保Excel文件包含以下列名之一: {CREDIT_NAMES}")
+
+    if grade_col is None:
+        raise ValueError(f"未找到绩点列。请确保Excel文件包含以下列名之一: {GRADE_NAMES}")
+
+    mapping = {credit_col: '学分', grade_col: '绩点'}
+
+    # 查找分组列（学年、课程性质）
+    mapping.update(find_group_columns(col for col in columns if col not in mapping))
+
+    # 查找课程名称列 - 精确匹配优先，避免"课程号"等列被当作课程名称
+    remaining = [col for col in columns if col not in mapping]
+    course_col = None
+    for col in remaining:
+        if str(col).strip().lower() in COURSE_NAMES:
+            course_col = col
+            break
+
+    # 如果精确匹配失败，再尝试模糊匹配（已跳过"课程性质"等分组列）
+    if course_col is None:
+        for col in remaining:
+            if any(name in str(col).lower() for name in COURSE_NAMES):
+                course_col = col
+                break
+
+    if course_col is not None:
+        mapping[course_col] = '课程名称'
+
+    return mapping
+
+
+def coerce_numeric(values) -> np.ndarray:
+    """将一列数据转换为float数组，无法转换的值设为NaN"""
+    return pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float)
+
+
+def valid_mask(credits: np.ndarray, grades: np.ndarray) -> np.ndarray:
+    """有效行：学分和绩点均为数字，且学分>0、绩点>=0"""
+    return np.isfinite(credits) & np.isfinite(grades) & (credits > 0) & (grades >= 0)
+
+
+def reduce_gpa(credits: np.ndarray, grades: np.ndarray) -> Tuple[float, float, float]:
+    """
+    汇总学分、权重分数和GPA
+
+    Args:
+        credits: 有效课程的学分数组
+        grades: 有效课程的绩点数组
+
+    Returns:
+        Tuple: (总学分, 总权重分数, GPA)
+    """
+    total_credits = float(credits.sum())
+    total_weighted_points = float((credits * grades).sum())
+    gpa = total_weighted_points / total_credits if total_credits > 0 else 0.0
+    return total_credits, total_weighted_points, gpa
+
+
+def clean_data(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    识别列名、转换数字并过滤无效行
+
+    Args:
+        df: 原始DataFrame
+
+    Returns:
+        Tuple: (清理后的DataFrame, 需要提示用户的信息列表)
+
+    Raises:
+        ValueError: 缺少必需列或没有有效数据
+    """
+    mapping, credits, grades, mask = _masked_arrays(df)
+    messages = _filter_messages(grades, mask)
+
+    # 课程名称在前，分组列在后
+    columns = {}
+    if '课程名称' in mapping.values():
+        columns['课程名称'] = df[_source(mapping, '课程名称')].to_numpy()[mask]
+    columns['学分'] = credits[mask]
+    columns['绩点'] = grades[mask]
+    for source, standard in mapping.items():
+        if standard not in columns:
+            columns[standard] = df[source].to_numpy()[mask]
+    df_clean = pd.DataFrame(columns, index=df.index[mask])
+
+    return df_clean, messages
+
+
+def compute_results(df_clean: pd.DataFrame) -> Dict[str, Any]:
+    """
+    计算每门课的权重分数和总GPA
+
+    Args:
+        df_clean: clean_data 返回的DataFrame
+
+    Returns:
+        Dict: 包含 courses、total_credits、total_weighted_points、gpa、course_count 的结果字典
+    """
+    credits = df_clean['学分'].to_numpy(dtype=float)
+    grades = df_clean['绩点'].to_numpy(dtype=float)
+    total_credits, total_weighted_points, gpa = reduce_gpa(credits, grades)
+
+    courses = df_clean.copy()
+    courses['权重分数'] = credits * grades
+
+    return {
+        'courses': courses,
+        'total_credits': total_credits,
+        'total_weighted_points': total_weighted_points,
+        'gpa': gpa,
+        'course_count': len(courses)
+    }
+
+
+def fast_gpa(df: pd.DataFrame) -> Tuple[float, List[str]]:
+    """
+    只计算GPA的快速路径：直接在NumPy数组上过滤和汇总，不构建中间DataFrame
+
+    结果和提示信息与 clean_data + compute_results 完全一致。
+
+    Args:
+        df: 原始DataFrame
+
+    Returns:
+        Tuple: (GPA, 需要提示用户的信息列表)
+
+    Raises:
+        ValueError: 缺少必需列或没有有效数据
+    """
+    _, credits, grades, mask = _masked_arrays(df)
+    messages = _filter_messages(grades, mask)
+    return reduce_gpa(credits[mask], grades[mask])[2], messages
+
+
+def _masked_arrays(df: pd.DataFrame) -> Tuple[Dict[Any, str], np.ndarray, np.ndarray, np.ndarray]:
+    """识别列名并转换学分、绩点，返回 (列名映射, 学分数组, 绩点数组, 有效行掩码)"""
+    mapping = resolve_columns(df.columns)
+    credits = coerce_numeric(df[_source(mapping, '学分')])
+    grades = coerce_numeric(df[_source(mapping, '绩点')])
+    return mapping, credits, grades, valid_mask(credits, grades)
+
+
+def _filter_messages(grades: np.ndarray, mask: np.ndarray) -> List[str]:
+    """
+    生成过滤结果的提示信息
+
+    Raises:
+        ValueError: 没有有效数据
+    """
+    messages = []
+    removed_count = len(mask) - int(mask.sum())
+    if removed_count > 0:
+        messages.append(f"已忽略 {removed_count} 行无效数据（学分或绩点为空/非数字，或学分≤0、绩点<0）")
+
+    if not mask.any():
+        raise ValueError("没有找到有效的学分和绩点数据")
+
+    if (grades[mask] > 5).any():
+        messages.append("警告: 发现绩点超出常规范围(0-5)，请检查数据是否正确")
+
+    return messages
+
+
+def _source(mapping: Dict[Any, str], standard: str) -> Any:
+    """根据标准列名查找原始列名"""
+    for source, name in mapping.items():
+        if name == standard:
+            return source
+    raise KeyError(standard)
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GPA结果导出
+功能：将课程明细和汇总结果导出为CSV、JSON、JSON Lines、xlsx或文本文件
+所有格式均按块流式写入，避免在内存中拼接完整报告
+"""
+
+import json
+import os
+from typing import Dict, Any, Optional, Iterator
+
+import pandas as pd
+
+# 每次写入的行数
+CHUNK_SIZE = 10000
+
+# 支持的导出格式及对应扩展名
+EXPORT_FORMATS = {
+    'csv': '.csv',
+    'json': '.json',
+    'jsonl': '.jsonl',
+    'xlsx': '.xlsx',
+    'txt': '.txt',
+}
+
+# 扩展名到格式的映射
+_EXTENSION_FORMATS = {ext: fmt for fmt, ext in EXPORT_FORMATS.items()}
+
+# 导出时课程明细的列顺序
+COURSE_COLUMNS = ['课程名称', '学分', '绩点', '权重分数']
+
+# 汇总字段及其中文标签
+SUMMARY_FIELDS = [
+    ('course_count', '课程总数'),
+    ('total_credits', '总学分'),
+    ('total_weighted_points', '总权重分数'),
+    ('gpa', 'GPA'),
+]
+
+
+def detect_format(file_path: str) -> str:
+    """
+    根据文件扩展名推断导出格式
+
+    Args:
+        file_path: 输出文件路径
+
+    Returns:
+        str: 导出格式，未知扩展名按文本格式处理
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    return _EXTENSION_FORMATS.get(ext, 'txt')
+
+
+def _prepare_courses(courses: pd.DataFrame) -> pd.DataFrame:
+    """整理课程明细的列，缺少课程名称时按序号生成"""
+    df = courses.copy()
+    if '课程名称' not in df.columns:
+        df.insert(0, '课程名称', [f"课程{i + 1}" for i in range(len(df))])
+    if '权重分数' not in df.columns:
+        df['权重分数'] = df['学分'] * df['绩点']
+
+    # 标准列在前，其余列（如学年、课程性质）保留在后
+    extra_columns = [col for col in df.columns if col not in COURSE_COLUMNS]
+    return df[COURSE_COLUMNS + extra_columns]
+
+
+def _iter_chunks(df: pd.DataFrame, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """按固定行数切分DataFrame"""
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def _summary(results: Dict[str, Any]) -> Dict[str, Any]:
+    """提取汇总字段并转换为Python原生类型"""
+    summary = {}
+    for key, _ in SUMMARY_FIELDS:
+        value = results[key]
+        summary[key] = int(value) if key == 'course_count' else float(value)
+    return summary
+
+
+def summary_path(file_path: str) -> str:
+    """CSV导出时汇总文件的路径，例如 result.csv -> result.summary.csv"""
+    return os.path.splitext(file_path)[0] + '.summary.csv'
+
+
+def _write_csv(courses: pd.DataFrame, results: Dict[str, Any], file_path: str, chunk_size: int):
+    """写出CSV：主文件只含课程明细，汇总写入同名的 .summary.csv 文件"""
+    # 使用utf-8-sig，便于Excel直接打开中文CSV
+    with open(file_path, 'w', encoding='utf-8-sig', newline='') as f:
+        header = True
+        for chunk in _iter_chunks(courses, chunk_size):
+            chunk.to_csv(f, header=header, index=False)
+            header = False
+        if header:
+            # 没有课程时仍写出表头
+            courses.to_csv(f, index=False)
+
+    summary = pd.DataFrame([_summary(results)], columns=[key for key, _ in SUMMARY_FIELDS])
+    summary.to_csv(summary_path(file_path), index=False, encoding='utf-8-sig')
+
+
+def _write_json(courses: pd.DataFrame, results: Dict[str, Any], file_path: str, chunk_size: int):
+    """写出JSON文档：{"courses": [...], "summary": {...}}，课程记录按块写入"""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write('{"courses": [')
+        first = True
+        for chunk in _iter_chunks(courses, chunk_size):
+            records = chunk.to_json(orient='records', force_ascii=False)
+            # 去掉每块外层的方括号，按逗号拼接成一个数组
+            records = records.strip()[1:-1]
+            if not records:
+                continue
+            if not first:
+                f.write(',')
+            f.write(records)
+            first = False
+        f.write('], "summary": ')
+        f.write(json.dumps(_summary(results), ensure_ascii=False))
+        f.write('}\n')
+
+
+def _write_jsonl(courses: pd.DataFrame, results: Dict[str, Any], file_path: str, chunk_size: int):
+    """写出JSON Lines：每门课程一行，最后一行为汇总"""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        for chunk in _iter_chunks(courses, chunk_size):
+            chunk = chunk.assign(type='course')
+            text = chunk.to_json(orient='records', lines=True, force_ascii=False)
+            f.write(text)
+            # 旧版pandas输出末尾不带换行
+            if not text.endswith('\n'):
+                f.write('\n')
+        summary = {'type': 'summary'}
+        summary.update(_summary(results))
+        f.write(json.dumps(summary, ensure_ascii=False))
+        f.write('\n')
+
+
+def _write_xlsx(courses: pd.DataFrame, results: Dict[str, Any], file_path: str, chunk_size: int):
+    """使用openpyxl只写模式写出xlsx：课程明细和汇总各一个工作表"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+
+    detail_sheet = workbook.create_sheet('课程明细')
+    detail_sheet.append(list(courses.columns))
+    for chunk in _iter_chunks(courses, chunk_size):
+        # 空值写为空单元格
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        for row in chunk.itertuples(index=False, name=None):
+            detail_sheet.append(row)
+
+    summary_sheet = workbook.create_sheet('汇总')
+    summary = _summary(results)
+    for key, label in SUMMARY_FIELDS:
+        summary_sheet.append([label, summary[key]])
+
+    workbook.save(file_path)
+
+
+def _write_txt(results: Dict[str, Any], file_path: str, source: Optional[str]):
+    """写出文本格式的汇总结果"""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(f"GPA计算结果\n")
+        if source:
+            f.write(f"文件: {source}\n")
+        f.write(f"总学分: {results['total_credits']:.1f}\n")
+        f.write(f"总权重分数: {results['total_weighted_points']:.2f}\n")
+        f.write(f"GPA: {results['gpa']:.4f}\n")
+
+
+def export_results(results: Dict[str, Any], file_path: str, fmt: Optional[str] = None,
+                   source: Optional[str] = None, chunk_size: int = CHUNK_SIZE) -> str:
+    """
+    导出GPA计算结果
+
+    Args:
+        results: GPACalculator.calculate_gpa 返回的结果字典
+        file_path: 输出文件路径
+        fmt: 导出格式（csv/json/jsonl/xlsx/txt），为空时根据扩展名推断
+        source: 源Excel文件路径，仅写入文本格式
+        chunk_size: 每次写入的行数，必须大于0
+
+    Returns:
+        str: 实际使用的导出格式
+
+    Raises:
+        ValueError: 不支持的导出格式或chunk_size无效
+    """
+    fmt = (fmt or detect_format(file_path)).lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"不支持的导出格式: {fmt}，可选格式: {list(EXPORT_FORMATS)}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size必须大于0: {chunk_size}")
+
+    if fmt == 'txt':
+        _write_txt(results, file_path, source)
+        return fmt
+
+    courses = _prepare_courses(results['courses'])
+    if fmt == 'csv':
+        _write_csv(courses, results, file_path, chunk_size)
+    elif fmt == 'json':
+        _write_json(courses, results, file_path, chunk_size)
+    elif fmt == 'jsonl':
+        _write_jsonl(courses, results, file_path, chunk_size)
+    else:
+        _write_xlsx(courses, results, file_path, chunk_size)
+    return fmt
@@ -9,7 +9,11 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import pandas as pd
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+import gpa_core
+from gpa_export import export_results, detect_format
+from gpa_index import GroupIndex, GROUP_DIMENSIONS
 
 class GPACalculatorGUI:
     """GPA计算器图形界面类"""
@@ -17,12 +21,13 @@ class GPACalculatorGUI:
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("GPA计算器")
-        self.root.geometry("900x700")
+        self.root.geometry("900x820")
         self.root.resizable(True, True)
         
         # 数据变量
         self.file_path = ""
         self.gpa_result = None
+        self.group_index = None
         
         # 创建界面
         self.setup_ui()
@@ -90,50 +95,29 @@ class GPACalculatorGUI:
             # 清空之前的结果
             self.clear_results()
     
-    def validate_excel_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """验证和清理Excel数据"""
-        # 检查必需的列
-        if '学分' not in df.columns:
-            raise ValueError("未找到'学分'列，请检查Excel文件格式")
-        
-        if '绩点' not in df.columns:
-            raise ValueError("未找到'绩点'列，请检查Excel文件格式")
-        
-        # 选择需要的列
-        columns_to_use = ['学分', '绩点']
-        if '课程名' in df.columns:
-            columns_to_use.insert(0, '课程名')
-        elif '课程名称' in df.columns:
-            columns_to_use.insert(0, '课程名称')
-        
-        # 创建工作数据
-        work_df = df[columns_to_use].copy()
+    def compute_from_file(self, file_path: str) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        读取Excel文件，清理数据，计算GPA并构建分组索引（不依赖界面组件）
         
-        # 删除空值行
-        initial_count = len(work_df)
-        work_df = work_df.dropna(subset=['学分', '绩点'])
-        removed_count = initial_count - len(work_df)
+        Args:
+            file_path: Excel文件路径
+            
+        Returns:
+            Tuple: (计算结果字典, 需要提示用户的信息列表)
+        """
+        # 读取Excel文件
+        df = pd.read_excel(file_path)
         
-        if removed_count > 0:
-            messagebox.showinfo("数据清理", f"已忽略 {removed_count} 行空数据")
+        # 验证数据
+        work_df, messages = gpa_core.clean_data(df)
         
-        if len(work_df) == 0:
-            raise ValueError("没有找到有效的数据行")
+        # 计算GPA并保存结果
+        self.gpa_result = gpa_core.compute_results(work_df)
         
-        # 转换为数字类型
-        try:
-            work_df['学分'] = pd.to_numeric(work_df['学分'])
-            work_df['绩点'] = pd.to_numeric(work_df['绩点'])
-        except Exception as e:
-            raise ValueError(f"数据格式错误，学分和绩点必须为数字: {str(e)}")
+        # 构建分组索引
+        self.group_index = GroupIndex(work_df)
         
-        # 过滤无效数据
-        work_df = work_df[(work_df['学分'] > 0) & (work_df['绩点'] >= 0)]
-        
-        if len(work_df) == 0:
-            raise ValueError("没有有效的学分和绩点数据")
-        
-        return work_df
+        return self.gpa_result, messages
     
     def calculate_gpa(self):
         """计算GPA并显示结果"""
@@ -146,31 +130,13 @@ class GPACalculatorGUI:
             self.gpa_label.config(text="正在计算中...", foreground="orange")
             self.root.update()
             
-            # 读取Excel文件
-            df = pd.read_excel(self.file_path)
-            
-            # 验证数据
-            work_df = self.validate_excel_data(df)
-            
-            # 计算权重分数
-            work_df['权重分数'] = work_df['学分'] * work_df['绩点']
-            
-            # 计算GPA
-            total_credits = work_df['学分'].sum()
-            total_weighted = work_df['权重分数'].sum()
-            gpa = total_weighted / total_credits
-            
-            # 保存结果
-            self.gpa_result = {
-                'data': work_df,
-                'gpa': gpa,
-                'total_credits': total_credits,
-                'total_weighted': total_weighted,
-                'course_count': len(work_df)
-            }
+            _, messages = self.compute_from_file(self.file_path)
+            if messages:
+                messagebox.showinfo("数据清理", "\n".join(messages))
             
             # 显示结果
             self.display_results()
+            self.update_filter_options()
             
         except Exception as e:
             self.gpa_label.config(text="计算失败", foreground="red")
@@ -212,10 +178,8 @@ class GPACalculatorGUI:
         output.append("")
         
         # 表头
-        data = result['data']
-        if '课程名' in data.columns:
-            output.append(f"{'课程名称':<30} {'学分':<8} {'绩点':<8} {'权重分数':<10}")
-        elif '课程名称' in data.columns:
+        data = result['courses']
+        if '课程名称' in data.columns:
             output.append(f"{'课程名称':<30} {'学分':<8} {'绩点':<8} {'权重分数':<10}")
         else:
             output.append(f"{'序号':<8} {'学分':<8} {'绩点':<8} {'权重分数':<10}")
@@ -224,10 +188,7 @@ class GPACalculatorGUI:
         
         # 课程详情
         for i, (_, row) in enumerate(data.iterrows()):
-            if '课程名' in data.columns:
-                course_name = str(row['课程名'])[:25]
-                output.append(f"{course_name:<30} {row['学分']:<8.1f} {row['绩点']:<8.2f} {row['权重分数']:<10.2f}")
-            elif '课程名称' in data.columns:
+            if '课程名称' in data.columns:
                 course_name = str(row['课程名称'])[:25]
                 output.append(f"{course_name:<30} {row['学分']:<8.1f} {row['绩点']:<8.2f} {row['权重分数']:<10.2f}")
             else:
@@ -237,7 +198,7 @@ class GPACalculatorGUI:
         output.append("=" * 80)
         output.append(f"📚 课程总数: {result['course_count']} 门")
         output.append(f"📊 总学分: {result['total_credits']:.1f}")
-        output.append(f"📈 总权重分数: {result['total_weighted']:.2f}")
+        output.append(f"📈 总权重分数: {result['total_weighted_points']:.2f}")
         output.append(f"🎯 平均学分绩点(GPA): {result['gpa']:.4f}")
         output.append("=" * 80)
         
@@ -263,6 +224,48 @@ class GPACalculatorGUI:
         self.result_text.delete(1.0, tk.END)
         self.gpa_label.config(text="等待计算...", foreground="black")
         self.gpa_result = None
+        self.group_index = None
+        self.update_filter_options()
+    
+    def update_filter_options(self):
+        """根据分组索引刷新筛选面板的可选项"""
+        self.prefix_var.set("")
+        for dim, listbox in self.filter_listboxes.items():
+            listbox.delete(0, tk.END)
+            if self.group_index and dim in self.group_index.values:
+                for value in self.group_index.values[dim]:
+                    listbox.insert(tk.END, value)
+        self.apply_filters()
+    
+    def apply_filters(self, *args):
+        """使用分组索引计算筛选后的GPA"""
+        if not self.group_index:
+            self.filter_label.config(text="计算GPA后可按学年、课程性质或课程名前缀筛选", foreground="gray")
+            return
+        
+        filters = {}
+        for dim, listbox in self.filter_listboxes.items():
+            if dim in self.group_index.dimensions:
+                filters[dim] = [listbox.get(i) for i in listbox.curselection()]
+        
+        result = self.group_index.query(filters, self.prefix_var.get().strip())
+        if result['course_count'] == 0:
+            self.filter_label.config(text="没有符合筛选条件的课程", foreground="red")
+            return
+        
+        self.filter_label.config(
+            text=(f"筛选GPA: {result['gpa']:.4f}    "
+                  f"课程: {result['course_count']} 门    "
+                  f"学分: {result['total_credits']:.1f}"),
+            foreground="blue"
+        )
+    
+    def reset_filters(self):
+        """清除所有筛选条件"""
+        for listbox in self.filter_listboxes.values():
+            listbox.selection_clear(0, tk.END)
+        self.prefix_var.set("")
+        self.apply_filters()
     
     def save_results(self):
         """保存结果到文件"""
@@ -273,14 +276,25 @@ class GPACalculatorGUI:
         save_path = filedialog.asksaveasfilename(
             title="保存计算结果",
             defaultextension=".txt",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+            filetypes=[
+                ("Text files", "*.txt"),
+                ("CSV files", "*.csv"),
+                ("JSON files", "*.json"),
+                ("JSON Lines files", "*.jsonl"),
+                ("Excel files", "*.xlsx"),
+                ("All files", "*.*")
+            ]
         )
         
         if save_path:
             try:
-                content = self.result_text.get(1.0, tk.END)
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                if detect_format(save_path) == 'txt':
+                    # 文本格式保存完整的计算详情和成绩分析
+                    content = self.result_text.get(1.0, tk.END)
+                    with open(save_path, 'w', encoding='utf-8') as f:
+                        f.write(content)
+                else:
+                    export_results(self.gpa_result, save_path)
                 messagebox.showinfo("成功", f"结果已保存到: {save_path}")
             except Exception as e:
                 messagebox.showerror("保存错误", f"保存文件时出错: {str(e)}")
@@ -295,7 +309,7 @@ class GPACalculatorGUI:
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
         main_frame.columnconfigure(0, weight=1)
-        main_frame.rowconfigure(4, weight=1)
+        main_frame.rowconfigure(5, weight=1)
         
         # 标题
         title_label = ttk.Label(main_frame, text="🎓 GPA计算器", style="Title.TLabel")
@@ -358,9 +372,41 @@ class GPACalculatorGUI:
         )
         self.save_button.pack(side=tk.LEFT)
         
+        # 分组筛选区域
+        filter_frame = ttk.LabelFrame(main_frame, text="🔍 分组筛选", padding="10")
+        filter_frame.grid(row=4, column=0, sticky=(tk.W, tk.E), pady=(0, 20))
+        
+        self.filter_listboxes = {}
+        for i, dim in enumerate(GROUP_DIMENSIONS):
+            ttk.Label(filter_frame, text=dim).grid(row=0, column=i, sticky=tk.W, padx=(0, 15))
+            listbox = tk.Listbox(
+                filter_frame,
+                selectmode=tk.MULTIPLE,
+                exportselection=False,
+                height=4,
+                width=16
+            )
+            listbox.grid(row=1, column=i, sticky=(tk.W, tk.N), padx=(0, 15))
+            listbox.bind("<<ListboxSelect>>", self.apply_filters)
+            self.filter_listboxes[dim] = listbox
+        
+        prefix_column = len(GROUP_DIMENSIONS)
+        ttk.Label(filter_frame, text="课程名前缀").grid(row=0, column=prefix_column, sticky=tk.W)
+        self.prefix_var = tk.StringVar()
+        self.prefix_var.trace_add("write", self.apply_filters)
+        prefix_entry = ttk.Entry(filter_frame, textvariable=self.prefix_var, width=20)
+        prefix_entry.grid(row=1, column=prefix_column, sticky=(tk.W, tk.N))
+        
+        reset_button = ttk.Button(filter_frame, text="重置筛选", command=self.reset_filters)
+        reset_button.grid(row=2, column=prefix_column, sticky=(tk.W, tk.N), pady=(10, 0))
+        
+        self.filter_label = ttk.Label(filter_frame, foreground="gray")
+        self.filter_label.grid(row=3, column=0, columnspan=prefix_column + 1, sticky=tk.W, pady=(10, 0))
+        self.apply_filters()
+        
         # 结果显示区域
         result_frame = ttk.LabelFrame(main_frame, text="📊 计算结果", padding="15")
-        result_frame.grid(row=4, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        result_frame.grid(row=5, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         result_frame.columnconfigure(0, weight=1)
         result_frame.rowconfigure(1, weight=1)
         
@@ -391,7 +437,7 @@ class GPACalculatorGUI:
 1. 点击"浏览文件"选择您的成绩Excel文件
 2. 确保文件包含"学分"和"绩点"列
 3. 点击"计算GPA"获得结果
-4. 可以保存计算结果到文本文件
+4. 可以保存计算结果到文本、CSV、JSON、JSON Lines或Excel文件
 
 支持的Excel格式：
 • 学分列：学分、学时、credit等
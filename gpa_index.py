@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GPA分组索引
+功能：预先汇总各分组（学年、课程性质）的学分和权重分数，
+使任意分组子集、分组并集以及课程名前缀的GPA查询无需重新遍历课程数据
+"""
+
+import re
+from bisect import bisect_left
+from typing import Dict, Any, List, Tuple, Optional, Iterable
+
+import pandas as pd
+
+# 分组维度的标准列名及可能的原始列名（按优先级排列）
+GROUP_DIMENSIONS = {
+    '学年': ['学年学期', '学年', '学期', 'year', 'semester'],
+    '课程性质': ['课程性质', '课程类别', '课程类型', '选课属性', 'category'],
+}
+
+# 默认启用的分组维度
+DEFAULT_DIMENSIONS = tuple(GROUP_DIMENSIONS)
+
+_ACADEMIC_YEAR_PATTERN = re.compile(r'(\d{4})\s*[-~至]\s*(\d{4})')
+
+
+def find_group_columns(columns: Iterable[Any]) -> Dict[Any, str]:
+    """
+    在原始列名中查找分组维度列
+
+    Args:
+        columns: DataFrame的列名
+
+    Returns:
+        Dict: 原始列名到标准列名的映射，未找到的维度不出现在结果中
+    """
+    columns = list(columns)
+    mapping = {}
+    for standard_name, candidates in GROUP_DIMENSIONS.items():
+        # 精确匹配优先，其次模糊匹配
+        found = None
+        for name in candidates:
+            for col in columns:
+                if col not in mapping and str(col).strip().lower() == name:
+                    found = col
+                    break
+            if found is not None:
+                break
+        if found is None:
+            for name in candidates:
+                for col in columns:
+                    if col not in mapping and name in str(col).lower():
+                        found = col
+                        break
+                if found is not None:
+                    break
+        if found is not None:
+            mapping[found] = standard_name
+    return mapping
+
+
+def normalize_label(value: Any) -> Any:
+    """将分组取值转换为字符串标签，含空单元格的数字列会被读成float，2023.0 归一为 2023"""
+    if pd.isna(value):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def normalize_academic_year(value: Any) -> Any:
+    """将"2023-2024-1"等学年学期值归一为"2023-2024"学年"""
+    value = normalize_label(value)
+    if pd.isna(value):
+        return value
+    match = _ACADEMIC_YEAR_PATTERN.search(value)
+    if match:
+        return f"{match.group(1)}-{match.group(2)}"
+    return value
+
+
+# 各维度的取值归一函数，未列出的维度使用 normalize_label
+_NORMALIZERS = {
+    '学年': normalize_academic_year,
+}
+
+
+class GroupIndex:
+    """
+    GPA分组索引
+
+    按所有配置维度的组合键汇总学分和权重分数；每个组合内课程按名称排序并
+    保存累计和，课程名前缀查询通过二分查找完成。
+    """
+
+    def __init__(self, df: pd.DataFrame, dimensions: Optional[Iterable[str]] = None):
+        """
+        构建分组索引
+
+        Args:
+            df: validate_data_format 返回的DataFrame
+            dimensions: 分组维度，默认为 DEFAULT_DIMENSIONS 中存在于数据里的列
+        """
+        if dimensions is None:
+            dimensions = [dim for dim in DEFAULT_DIMENSIONS if dim in df.columns]
+        self.dimensions = list(dimensions)
+
+        missing = [dim for dim in self.dimensions if dim not in df.columns]
+        if missing:
+            raise ValueError(f"数据中缺少分组列: {missing}")
+
+        work_df = pd.DataFrame({
+            '学分': df['学分'].astype(float),
+            '权重分数': df['学分'].astype(float) * df['绩点'].astype(float),
+        }, index=df.index)
+        if '课程名称' in df.columns:
+            work_df['课程名称'] = df['课程名称'].fillna('').astype(str)
+        else:
+            work_df['课程名称'] = ''
+
+        for dim in self.dimensions:
+            normalizer = _NORMALIZERS.get(dim, normalize_label)
+            work_df[dim] = df[dim].map(normalizer).fillna('未分类').astype(str)
+
+        work_df = work_df.sort_values(self.dimensions + ['课程名称'], kind='mergesort')
+
+        # 组合键 -> (排序后的课程名, 学分累计和, 权重分数累计和)
+        self._groups: Dict[Tuple[str, ...], Tuple[List[str], List[float], List[float]]] = {}
+        if self.dimensions:
+            grouped = work_df.groupby(self.dimensions, sort=False)
+        else:
+            grouped = [((), work_df)]
+        for key, group in grouped:
+            if not isinstance(key, tuple):
+                key = (key,)
+            self._groups[key] = (
+                group['课程名称'].tolist(),
+                [0.0] + group['学分'].cumsum().tolist(),
+                [0.0] + group['权重分数'].cumsum().tolist(),
+            )
+
+        # 各维度的可选取值
+        self.values: Dict[str, List[str]] = {
+            dim: sorted({key[i] for key in self._groups})
+            for i, dim in enumerate(self.dimensions)
+        }
+
+    def query(self, filters: Optional[Dict[str, Iterable[str]]] = None,
+              name_prefix: Optional[str] = None) -> Dict[str, Any]:
+        """
+        查询子集GPA
+
+        同一维度内的多个取值取并集，不同维度之间取交集。
+
+        Args:
+            filters: 维度到可选取值的映射，例如 {'学年': ['2023-2024'], '课程性质': ['必修']}；
+                     未给出或取值为空的维度不做筛选
+            name_prefix: 课程名前缀（可选）
+
+        Returns:
+            Dict: 包含 total_credits、total_weighted_points、gpa、course_count 的结果字典
+
+        Raises:
+            ValueError: 筛选了未建立索引的维度
+        """
+        selected = []
+        for dim, values in (filters or {}).items():
+            if dim not in self.dimensions:
+                raise ValueError(f"未建立索引的分组维度: {dim}")
+            values = set(values)
+            if values:
+                selected.append((self.dimensions.index(dim), values))
+
+        total_credits = 0.0
+        total_weighted_points = 0.0
+        course_count = 0
+        for key, (names, cum_credits, cum_weighted) in self._groups.items():
+            if any(key[i] not in values for i, values in selected):
+                continue
+            if name_prefix:
+                start = bisect_left(names, name_prefix)
+                # 前缀后接最大码位，得到所有以该前缀开头的名称的上界
+                end = bisect_left(names, name_prefix + '\U0010ffff', start)
+            else:
+                start, end = 0, len(names)
+            total_credits += cum_credits[end] - cum_credits[start]
+            total_weighted_points += cum_weighted[end] - cum_weighted[start]
+            course_count += end - start
+
+        gpa = total_weighted_points / total_credits if total_credits > 0 else 0
+        return {
+            'total_credits': total_credits,
+            'total_weighted_points': total_weighted_points,
+            'gpa': gpa,
+            'course_count': course_count
+        }
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+结果导出测试：各格式按块写出后重新读取，检查行数和汇总是否一致
+"""
+
+import json
+import sys
+
+import pandas as pd
+import pytest
+
+import gpa_core
+import gpa_export
+from gpa_calculator import main
+
+
+def make_results(count):
+    df = pd.DataFrame({
+        '课程名称': [f"课程{i}" for i in range(count)],
+        '学分': [float(i % 4 + 1) for i in range(count)],
+        '绩点': [float(i % 5) for i in range(count)],
+    })
+    return gpa_core.compute_results(df)
+
+
+def expected_summary(results):
+    return {
+        'course_count': results['course_count'],
+        'total_credits': pytest.approx(results['total_credits']),
+        'total_weighted_points': pytest.approx(results['total_weighted_points']),
+        'gpa': pytest.approx(results['gpa']),
+    }
+
+
+COUNTS = [0, 1, 7]
+CHUNK_SIZES = [1, gpa_export.CHUNK_SIZE]
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('count', COUNTS)
+def test_csv_round_trip(tmp_path, count, chunk_size):
+    results = make_results(count)
+    path = str(tmp_path / 'result.csv')
+    assert gpa_export.export_results(results, path, chunk_size=chunk_size) == 'csv'
+
+    courses = pd.read_csv(path, encoding='utf-8-sig')
+    assert len(courses) == count
+    assert list(courses.columns) == gpa_export.COURSE_COLUMNS
+    assert courses['学分'].sum() == pytest.approx(results['total_credits'])
+
+    summary = pd.read_csv(gpa_export.summary_path(path), encoding='utf-8-sig')
+    assert len(summary) == 1
+    assert summary.iloc[0].to_dict() == expected_summary(results)
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('count', COUNTS)
+def test_json_round_trip(tmp_path, count, chunk_size):
+    results = make_results(count)
+    path = str(tmp_path / 'result.json')
+    assert gpa_export.export_results(results, path, chunk_size=chunk_size) == 'json'
+
+    with open(path, encoding='utf-8') as f:
+        document = json.load(f)
+    assert [course['课程名称'] for course in document['courses']] == [f"课程{i}" for i in range(count)]
+    assert document['summary'] == expected_summary(results)
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('count', COUNTS)
+def test_jsonl_round_trip(tmp_path, count, chunk_size):
+    results = make_results(count)
+    path = str(tmp_path / 'result.jsonl')
+    assert gpa_export.export_results(results, path, chunk_size=chunk_size) == 'jsonl'
+
+    with open(path, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert [record['type'] for record in records] == ['course'] * count + ['summary']
+    summary = records[-1]
+    del summary['type']
+    assert summary == expected_summary(results)
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('count', COUNTS)
+def test_xlsx_round_trip(tmp_path, count, chunk_size):
+    results = make_results(count)
+    path = str(tmp_path / 'result.xlsx')
+    assert gpa_export.export_results(results, path, chunk_size=chunk_size) == 'xlsx'
+
+    sheets = pd.read_excel(path, sheet_name=None)
+    assert list(sheets) == ['课程明细', '汇总']
+    assert len(sheets['课程明细']) == count
+    assert list(sheets['课程明细'].columns) == gpa_export.COURSE_COLUMNS
+
+    summary_sheet = pd.read_excel(path, sheet_name='汇总', header=None)
+    values = dict(zip(summary_sheet[0], summary_sheet[1]))
+    expected = expected_summary(results)
+    for key, label in gpa_export.SUMMARY_FIELDS:
+        assert values[label] == expected[key]
+
+
+def test_detect_format():
+    for fmt, ext in gpa_export.EXPORT_FORMATS.items():
+        assert gpa_export.detect_format(f"result{ext.upper()}") == fmt
+    assert gpa_export.detect_format('result.out') == 'txt'
+
+
+def test_invalid_chunk_size(tmp_path):
+    with pytest.raises(ValueError):
+        gpa_export.export_results(make_results(3), str(tmp_path / 'result.csv'), chunk_size=0)
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        gpa_export.export_results(make_results(3), str(tmp_path / 'result.csv'), fmt='parquet')
+
+
+def test_cli_format_requires_output(monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['gpa_calculator.py', 'grades.xlsx', '--format', 'json'])
+    with pytest.raises(SystemExit) as excinfo:
+        main()
+    assert excinfo.value.code == 2
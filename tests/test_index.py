@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+分组索引测试：query 的结果应与直接筛选DataFrame后调用 calculate_gpa 一致
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gpa_calculator import GPACalculator
+from gpa_index import GroupIndex
+
+
+def course_frame():
+    return pd.DataFrame({
+        '课程名称': ['高等数学A', '高等数学B', '线性代数', '大学英语', '体育', '高级语言程序设计', '军事理论', '大学物理'],
+        '学年学期': ['2021-2022-1', '2021-2022-2', '2022-2023-1', '2022-2023-1',
+                 '2022-2023-2', '2023-2024-1', '2023-2024-1', '2023-2024-2'],
+        '课程性质': ['必修', '必修', '必修', '必修', '选修', '必修', '选修', '必修'],
+        '学分': [5, 5, 3, 2, 1, 3.5, 1, 4],
+        '绩点': [3.7, 3.3, 4.0, 2.7, 3.0, 3.8, 4.0, 2.3],
+    })
+
+
+@pytest.fixture
+def calculator():
+    return GPACalculator()
+
+
+@pytest.fixture
+def clean_df(calculator):
+    return calculator.validate_data_format(course_frame())
+
+
+def expected(calculator, df):
+    results = calculator.calculate_gpa(df.copy())
+    return results['gpa'], results['total_credits'], results['course_count']
+
+
+def assert_query_matches(result, calculator, df):
+    gpa, total_credits, course_count = expected(calculator, df)
+    assert result['course_count'] == course_count
+    assert result['total_credits'] == pytest.approx(total_credits)
+    assert result['gpa'] == pytest.approx(gpa)
+
+
+def test_index_values(calculator, clean_df):
+    index = calculator.build_group_index(clean_df)
+    assert index.values == {
+        '学年': ['2021-2022', '2022-2023', '2023-2024'],
+        '课程性质': ['必修', '选修'],
+    }
+
+
+def test_no_filter_matches_full_gpa(calculator, clean_df):
+    index = GroupIndex(clean_df)
+    assert_query_matches(index.query(), calculator, clean_df)
+
+
+def test_union_of_two_years(calculator, clean_df):
+    index = GroupIndex(clean_df)
+    result = index.query({'学年': ['2021-2022', '2023-2024']})
+    subset = clean_df[clean_df['学年'].str[:9].isin(['2021-2022', '2023-2024'])]
+    assert_query_matches(result, calculator, subset)
+
+
+def test_year_category_intersection(calculator, clean_df):
+    index = GroupIndex(clean_df)
+    result = index.query({'学年': ['2022-2023', '2023-2024'], '课程性质': ['必修']})
+    subset = clean_df[clean_df['学年'].str[:9].isin(['2022-2023', '2023-2024'])
+                      & (clean_df['课程性质'] == '必修')]
+    assert_query_matches(result, calculator, subset)
+
+
+def test_name_prefix_inside_group(calculator, clean_df):
+    index = GroupIndex(clean_df)
+    result = index.query({'课程性质': ['必修']}, name_prefix='高')
+    subset = clean_df[(clean_df['课程性质'] == '必修') & clean_df['课程名称'].str.startswith('高')]
+    assert len(subset) == 3
+    assert_query_matches(result, calculator, subset)
+
+
+def test_empty_result(clean_df):
+    index = GroupIndex(clean_df)
+    result = index.query({'学年': ['2021-2022'], '课程性质': ['选修']})
+    assert result['course_count'] == 0
+    assert result['total_credits'] == 0
+    assert result['gpa'] == 0
+
+    result = index.query(name_prefix='不存在')
+    assert result['course_count'] == 0
+    assert result['gpa'] == 0
+
+
+def test_numeric_year_with_blank(calculator):
+    df = calculator.validate_data_format(pd.DataFrame({
+        '课程名称': ['a', 'b', 'c', 'd'],
+        '学年': [2023, np.nan, 2024, 2023],
+        '学分': [2, 2, 1, 3],
+        '绩点': [3.0, 2.0, 4.0, 3.5],
+    }))
+    index = GroupIndex(df)
+    assert index.values['学年'] == ['2023', '2024', '未分类']
+
+    assert_query_matches(index.query({'学年': ['2023']}), calculator, df[df['学年'] == 2023])
+    assert_query_matches(index.query({'学年': ['未分类']}), calculator, df[df['学年'].isna()])
+
+
+def test_unknown_dimension_raises(clean_df):
+    index = GroupIndex(clean_df, dimensions=['学年'])
+    with pytest.raises(ValueError):
+        index.query({'课程性质': ['必修']})
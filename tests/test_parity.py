@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+命令行版、图形界面版和快速路径的结果一致性测试：同一个Excel文件端到端计算
+"""
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+pytest.importorskip("tkinter")
+
+from gpa_calculator import GPACalculator
+from gpa_gui import GPACalculatorGUI
+
+
+def mixed_frame():
+    """包含空值、非数字、学分为0、绩点为负、绩点超过5、课程号列和分组列的数据"""
+    return pd.DataFrame({
+        '课程号': ['A1', 'A2', 'A3', 'A4', 'A5', 'A6', 'A7', 'A8'],
+        '课程性质': ['必修', '必修', '选修', '必修', '选修', '必修', '选修', '必修'],
+        '课程名称': ['高等数学A', '线性代数', '体育', '大学英语', '军事理论', '概率论', '形势与政策', 'C++程序设计'],
+        '学年学期': ['2022-2023-1', '2022-2023-2', '2022-2023-1', '2023-2024-1',
+                 '2023-2024-1', '2023-2024-2', '2023-2024-2', '2023-2024-2'],
+        '学分': [4, 3, None, 'x', 0, 3, 1, 2.5],
+        '绩点': [3.7, 4.0, 3.0, 3.3, 4.0, -1, None, 5.5],
+    })
+
+
+FRAMES = {
+    'mixed': mixed_frame(),
+    'english_headers': pd.DataFrame({
+        'Course': ['Calculus', 'Physics', 'Art'],
+        'Credits': [4, 3, 'n/a'],
+        'GPA': [3.1, 2.2, 4.0],
+    }),
+    'credit_grade_only': pd.DataFrame({
+        '学分': [1, 2, 3],
+        '绩点': [4.0, 3.0, 2.0],
+    }),
+    'zero_credit_only_invalid': pd.DataFrame({
+        '学分': [0, 2],
+        '绩点': [3.0, 3.5],
+    }),
+    'numeric_year_with_blank': pd.DataFrame({
+        '课程名称': ['a', 'b', 'c'],
+        '学年': [2023, np.nan, 2024],
+        '学分': [2, 2, 1],
+        '绩点': [3.0, 2.0, 4.0],
+    }),
+}
+
+
+def write_xlsx(tmp_path, df):
+    path = str(tmp_path / 'grades.xlsx')
+    df.to_excel(path, index=False)
+    return path
+
+
+def printed_messages(output):
+    return [line for line in output.splitlines() if line.startswith(('已忽略', '警告'))]
+
+
+def run_cli(path, capsys):
+    calculator = GPACalculator()
+    gpa = calculator.process_file(path)
+    messages = printed_messages(capsys.readouterr().out)
+    return calculator, gpa, messages
+
+
+def run_gui(path):
+    # 不创建窗口，只调用与界面无关的计算方法
+    gui = GPACalculatorGUI.__new__(GPACalculatorGUI)
+    results, messages = gui.compute_from_file(path)
+    return gui, results, messages
+
+
+def run_fast(path, capsys):
+    calculator = GPACalculator()
+    gpa = calculator.quick_gpa(calculator.read_excel_file(path))
+    messages = printed_messages(capsys.readouterr().out)
+    return gpa, messages
+
+
+@pytest.mark.parametrize('name', list(FRAMES))
+def test_cli_gui_fast_path_match(tmp_path, capsys, name):
+    path = write_xlsx(tmp_path, FRAMES[name])
+
+    calculator, cli_gpa, cli_messages = run_cli(path, capsys)
+    gui, gui_results, gui_messages = run_gui(path)
+    fast_gpa, fast_messages = run_fast(path, capsys)
+    cli_results = calculator.results
+
+    assert cli_gpa == cli_results['gpa'] == gui_results['gpa'] == fast_gpa
+    assert cli_results['total_credits'] == gui_results['total_credits']
+    assert cli_results['total_weighted_points'] == gui_results['total_weighted_points']
+    assert cli_results['course_count'] == gui_results['course_count']
+    pdt.assert_frame_equal(cli_results['courses'], gui_results['courses'])
+    assert cli_messages == gui_messages == fast_messages
+
+    # 图形界面保存的结果与返回值一致，并已构建分组索引
+    assert gui.gpa_result is gui_results
+    assert gui.group_index.query()['gpa'] == pytest.approx(cli_gpa)
+
+
+def test_mixed_frame_values(tmp_path, capsys):
+    path = write_xlsx(tmp_path, FRAMES['mixed'])
+    calculator, _, messages = run_cli(path, capsys)
+    results = calculator.results
+    courses = results['courses']
+
+    # 空值、非数字、学分为0、绩点为负的行被过滤，课程号列不作为课程名称
+    assert courses['课程名称'].tolist() == ['高等数学A', '线性代数', 'C++程序设计']
+    assert list(courses.columns) == ['课程名称', '学分', '绩点', '学年', '课程性质', '权重分数']
+    assert results['total_credits'] == pytest.approx(9.5)
+    assert results['total_weighted_points'] == pytest.approx(14.8 + 12.0 + 13.75)
+    assert results['gpa'] == pytest.approx((14.8 + 12.0 + 13.75) / 9.5)
+    assert len(messages) == 2
+    assert messages[0].startswith('已忽略 5 行')
+
+
+def test_no_valid_rows(tmp_path, capsys):
+    path = write_xlsx(tmp_path, pd.DataFrame({'学分': [0, 'x'], '绩点': [3.0, 2.0]}))
+
+    calculator, gpa, _ = run_cli(path, capsys)
+    assert gpa == 0.0
+    assert calculator.results is None
+
+    with pytest.raises(ValueError):
+        run_gui(path)
+    with pytest.raises(ValueError):
+        run_fast(path, capsys)